@@ -5,8 +5,16 @@ This shows how restaurants/delivery companies would integrate
 the Oman Address API into their systems.
 """
 
+import asyncio
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List
+
+try:
+    import httpx  # Only needed for AsyncOmanAddressClient
+except ImportError:
+    httpx = None
 
 class OmanAddressClient:
     """
@@ -18,10 +26,37 @@ class OmanAddressClient:
         print(f"Navigate to: {address['google_maps_link']}")
     """
     
-    def __init__(self, api_key: str, base_url: str = "http://localhost:8000"):
+    def __init__(self, api_key: str, base_url: str = "http://localhost:8000", use_batch: bool = False):
         self.api_key = api_key
         self.base_url = base_url
         self.headers = {"X-API-Key": api_key}
+        
+        # One session per client keeps connections alive between calls,
+        # so repeated lookups skip the TCP/TLS handshake
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.params = {"X-API-Key": api_key}
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Only set use_batch=True for servers that provide /api/lookup-batch;
+        # cleared if the server turns out not to have it
+        self.batch_supported = use_batch
+    
+    def close(self):
+        """Close the underlying HTTP session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def lookup_by_phone(self, phone: str) -> Optional[Dict]:
         """
@@ -34,9 +69,9 @@ class OmanAddressClient:
             Dictionary with address details or None if not found
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/lookup",
-                params={"phone": phone, "X-API-Key": self.api_key}
+                params={"phone": phone}
             )
             
             if response.status_code == 200:
@@ -61,9 +96,9 @@ class OmanAddressClient:
             Dictionary with address details or None if not found
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/lookup",
-                params={"address_code": address_code, "X-API-Key": self.api_key}
+                params={"address_code": address_code}
             )
             
             if response.status_code == 200:
@@ -77,6 +112,42 @@ class OmanAddressClient:
             print(f"Error looking up address: {str(e)}")
             return None
     
+    def lookup_batch(self, phones: List[str]) -> List[Optional[Dict]]:
+        """
+        Look up several addresses by phone number
+        
+        Uses a single /api/lookup-batch request when the client was created
+        with use_batch=True; otherwise (or if the server does not provide the
+        endpoint) makes one lookup_by_phone call per number.
+        
+        Args:
+            phones: Phone numbers with country code
+            
+        Returns:
+            List of address dictionaries in the same order as phones,
+            with None for numbers that are not registered
+        """
+        if not self.batch_supported:
+            return [self.lookup_by_phone(phone) for phone in phones]
+        
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/lookup-batch",
+                json={"phones": phones}
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code in (404, 405):
+                self.batch_supported = False
+                return [self.lookup_by_phone(phone) for phone in phones]
+            else:
+                raise Exception(f"API Error: {response.text}")
+                
+        except Exception as e:
+            print(f"Error looking up addresses: {str(e)}")
+            return [None] * len(phones)
+    
     def verify_delivery(self, address_code: str, success: bool, feedback: str = None) -> bool:
         """
         Mark a delivery as successful or failed
@@ -90,9 +161,8 @@ class OmanAddressClient:
             True if verification was recorded successfully
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/verify-delivery",
-                params={"X-API-Key": self.api_key},
                 json={
                     "address_code": address_code,
                     "success": success,
@@ -107,6 +177,68 @@ class OmanAddressClient:
             return False
 
 
+class AsyncOmanAddressClient:
+    """
+    Async client for Oman Address API, for running many lookups concurrently
+    
+    Requires httpx (pip install httpx). HTTP/2 is off by default: httpx only
+    negotiates it over TLS, and it needs the h2 extra (pip install "httpx[http2]").
+    
+    Usage:
+        async with AsyncOmanAddressClient(api_key="your_api_key_here") as client:
+            address = await client.lookup_by_phone("96891234567")
+    """
+    
+    def __init__(self, api_key: str, base_url: str = "http://localhost:8000", http2: bool = False):
+        if httpx is None:
+            raise ImportError("AsyncOmanAddressClient requires httpx: pip install httpx")
+        
+        self.api_key = api_key
+        self.base_url = base_url
+        self._c = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"X-API-Key": api_key},
+            params={"X-API-Key": api_key},
+            http2=http2,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=10.0
+        )
+    
+    async def close(self):
+        """Close the underlying HTTP client"""
+        await self._c.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def lookup_by_phone(self, phone: str) -> Optional[Dict]:
+        """
+        Look up address by phone number
+        
+        Args:
+            phone: Phone number with country code (e.g., 96891234567)
+            
+        Returns:
+            Dictionary with address details or None if not found
+        """
+        try:
+            response = await self._c.get("/api/lookup", params={"phone": phone})
+            
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                return None
+            else:
+                raise Exception(f"API Error: {response.text}")
+                
+        except Exception as e:
+            print(f"Error looking up address: {str(e)}")
+            return None
+
+
 # Example 1: Simple restaurant integration
 def restaurant_delivery_flow():
     """
@@ -228,9 +360,50 @@ def batch_validation():
     
     print(f"Validating {len(phone_numbers)} addresses...\n")
     
+    # One lookup per phone number; pass use_batch=True to the client to
+    # send the whole list in one request on servers with /api/lookup-batch
+    addresses = client.lookup_batch(phone_numbers)
+    
+    valid_count = 0
+    for phone, address in zip(phone_numbers, addresses):
+        if address:
+            valid_count += 1
+            print(f"✓ {phone}: {address['area']}, {address['city']}")
+        else:
+            print(f"❌ {phone}: Not found")
+    
+    print(f"\nResult: {valid_count}/{len(phone_numbers)} addresses valid")
+
+
+# Example 5: Concurrent address validation
+async def concurrent_validation():
+    """
+    Example: Validate many addresses concurrently when the batch
+    endpoint is not available
+    """
+    print("\n=== CONCURRENT ADDRESS VALIDATION ===\n")
+    
+    phone_numbers = [
+        "96891234567",
+        "96891234568",
+        "96891234569",
+        "96899999999"  # This one doesn't exist
+    ]
+    
+    print(f"Validating {len(phone_numbers)} addresses...\n")
+    
+    async with AsyncOmanAddressClient(api_key="omaddr_batch123") as client:
+        # Cap the number of lookups in flight at once
+        sem = asyncio.Semaphore(16)
+        
+        async def lookup(phone):
+            async with sem:
+                return await client.lookup_by_phone(phone)
+        
+        addresses = await asyncio.gather(*[lookup(p) for p in phone_numbers])
+    
     valid_count = 0
-    for phone in phone_numbers:
-        address = client.lookup_by_phone(phone)
+    for phone, address in zip(phone_numbers, addresses):
         if address:
             valid_count += 1
             print(f"✓ {phone}: {address['area']}, {address['city']}")
@@ -256,6 +429,7 @@ if __name__ == "__main__":
     # ecommerce_checkout_flow()
     # address_code_flow()
     # batch_validation()
+    # asyncio.run(concurrent_validation())
     
     print("\n" + "=" * 60)
     print("To use this in production:")
@@ -1,34 +1,142 @@
 """
 Test script to demonstrate Oman Address API functionality
 Run this after starting the API server
+
+Runtime is dominated by network round-trips; on the interpreter side, a
+CPython built with --enable-optimizations --with-lto (PGO/LTO) runs the
+script's own Python code faster.
 """
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fastest available JSON library; dumps() always returns bytes
+try:
+    import orjson as _json
+    dumps = _json.dumps
+    loads = _json.loads
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+    dumps = lambda o: _json.dumps(o).encode()
+    loads = _json.loads
 
 BASE_URL = "http://localhost:8000"
+URL_REQUEST_KEY = BASE_URL + "/api/request-key"
+URL_REGISTER = BASE_URL + "/api/register-address"
+URL_REGISTER_BULK = BASE_URL + "/api/register-address/bulk"
+# Set to True when the server exposes the bulk registration endpoint
+USE_BULK_REGISTER = False
+URL_LOOKUP = BASE_URL + "/api/lookup"
+URL_VERIFY = BASE_URL + "/api/verify-delivery"
+URL_STATS = BASE_URL + "/stats"
+JSON_HDR = {"Content-Type": "application/json"}
+_BAR = "=" * 60
+
+# Shared session so every demo call reuses the same keep-alive connection.
+# Failed connection attempts are retried for every method, but read errors
+# and gateway errors only for GET: a POST may already have been processed
+# (a duplicate verify-delivery or request-key would be recorded twice)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods={"GET"}
+    )
+))
+SESSION.headers["Connection"] = "keep-alive"
+
+def post_json(url, payload, headers=None, **kwargs):
+    """POST a JSON body"""
+    return post_body(url, dumps(payload), headers, **kwargs)
+
+def post_body(url, body, headers=None, **kwargs):
+    """POST an already-encoded JSON body"""
+    if headers:
+        headers = {**JSON_HDR, **headers}
+    else:
+        headers = JSON_HDR
+    return SESSION.post(url, data=body, headers=headers, **kwargs)
+
+# Step 5 registrations, with their request bodies encoded once at import
+_TEST_ADDRESS_DATA = (
+    {
+        "phone": "96891234568",
+        "latitude": 23.5905,
+        "longitude": 58.4055,
+        "area": "Qurum",
+        "city": "Muscat",
+        "delivery_notes": "Blue building, 3rd floor"
+    },
+    {
+        "phone": "96891234569",
+        "latitude": 23.6100,
+        "longitude": 58.5450,
+        "area": "Al Ghubrah",
+        "city": "Muscat",
+        "delivery_notes": "Ring doorbell twice"
+    }
+)
+TEST_ADDRESS_BYTES = tuple(dumps(a) for a in _TEST_ADDRESS_DATA)
+TEST_ADDRESSES_BULK_BYTES = dumps({"addresses": list(_TEST_ADDRESS_DATA)})
+# Read-only views for the demo itself (JSON encoders need the plain dicts above)
+TEST_ADDRESSES = tuple(MappingProxyType(dict(d)) for d in _TEST_ADDRESS_DATA)
+
+# Last /stats body and its ETag, so unchanged polls can be answered with a 304
+_stats_etag = None
+_stats = None
+
+def get_stats():
+    """Fetch /stats, reusing the previous result when the server replies 304"""
+    global _stats_etag, _stats
+    headers = {"If-None-Match": _stats_etag} if _stats_etag else {}
+    response = SESSION.get(URL_STATS, headers=headers)
+    if response.status_code == 304:
+        return _stats
+    _stats_etag = response.headers.get("ETag")
+    _stats = loads(response.content)
+    return _stats
 
 def print_section(title):
-    print("\n" + "="*60)
-    print(f"  {title}")
-    print("="*60)
+    print("\n" + _BAR + "\n  " + title + "\n" + _BAR)
+
+def write_lines(lines):
+    """Write a step's output lines to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def test_api():
     print_section("OMAN ADDRESS API - DEMO")
     
     # Step 1: Request API key for a delivery partner
     print_section("Step 1: Delivery Partner Requests API Key")
-    response = requests.post(f"{BASE_URL}/api/request-key", json={
+    response = post_json(URL_REQUEST_KEY, {
         "partner_name": "Al Maha Restaurant"
     })
-    partner_data = response.json()
+    partner_data = loads(response.content)
     api_key = partner_data['api_key']
-    print(f"✓ Partner: {partner_data['partner_name']}")
-    print(f"✓ API Key: {api_key[:20]}...")
+    # The deployed API reads the key from the query string; it is also
+    # sent as a header for servers that accept it there
+    auth_params = {"X-API-Key": api_key}
+    auth_headers = {"X-API-Key": api_key}
+    write_lines([
+        f"✓ Partner: {partner_data['partner_name']}",
+        f"✓ API Key: {api_key[:20]}..."
+    ])
     
     # Step 2: Resident registers their home address
     print_section("Step 2: Resident Registers Home Address")
-    response = requests.post(f"{BASE_URL}/api/register-address", json={
+    response = post_json(URL_REGISTER, {
         "phone": "96891234567",
         "latitude": 23.5880,
         "longitude": 58.3829,
@@ -37,80 +145,92 @@ def test_api():
         "po_box": "123",
         "delivery_notes": "White gate, call when you arrive"
     })
-    resident_data = response.json()
+    resident_data = loads(response.content)
     address_code = resident_data['address_code']
-    print(f"✓ Address Code: {address_code}")
-    print(f"✓ Google Maps: {resident_data['google_maps_link']}")
+    write_lines([
+        f"✓ Address Code: {address_code}",
+        f"✓ Google Maps: {resident_data['google_maps_link']}"
+    ])
     
     # Step 3: Delivery partner looks up address
     print_section("Step 3: Delivery Partner Looks Up Address")
-    response = requests.get(
-        f"{BASE_URL}/api/lookup",
-        params={"phone": "96891234567", "X-API-Key": api_key}
+    response = SESSION.get(
+        URL_LOOKUP,
+        params={"phone": "96891234567", **auth_params},
+        headers=auth_headers
     )
-    lookup_data = response.json()
-    print(f"✓ Found Address: {lookup_data['address_code']}")
-    print(f"✓ Location: {lookup_data['city']}, {lookup_data['area']}")
-    print(f"✓ Coordinates: {lookup_data['latitude']}, {lookup_data['longitude']}")
-    print(f"✓ Delivery Notes: {lookup_data['delivery_notes']}")
-    print(f"✓ Navigate: {lookup_data['google_maps_link']}")
+    lookup_data = loads(response.content)
+    ac, city, area, lat, lon, notes, link = (lookup_data[k] for k in (
+        "address_code", "city", "area", "latitude", "longitude",
+        "delivery_notes", "google_maps_link"
+    ))
+    write_lines([
+        f"✓ Found Address: {ac}",
+        f"✓ Location: {city}, {area}",
+        f"✓ Coordinates: {lat}, {lon}",
+        f"✓ Delivery Notes: {notes}",
+        f"✓ Navigate: {link}"
+    ])
     
     # Step 4: Mark delivery as successful
     print_section("Step 4: Verify Successful Delivery")
-    response = requests.post(
-        f"{BASE_URL}/api/verify-delivery",
-        params={"X-API-Key": api_key},
-        json={
+    response = post_json(
+        URL_VERIFY,
+        {
             "address_code": address_code,
             "success": True,
             "feedback": "Easy to find, customer was happy"
-        }
+        },
+        params=auth_params,
+        headers=auth_headers
     )
-    print(f"✓ Delivery verified: {response.json()['message']}")
+    print(f"✓ Delivery verified: {loads(response.content)['message']}")
     
     # Step 5: Register more test addresses
     print_section("Step 5: Registering Additional Test Addresses")
-    test_addresses = [
-        {
-            "phone": "96891234568",
-            "latitude": 23.5905,
-            "longitude": 58.4055,
-            "area": "Qurum",
-            "city": "Muscat",
-            "delivery_notes": "Blue building, 3rd floor"
-        },
-        {
-            "phone": "96891234569",
-            "latitude": 23.6100,
-            "longitude": 58.5450,
-            "area": "Al Ghubrah",
-            "city": "Muscat",
-            "delivery_notes": "Ring doorbell twice"
-        }
-    ]
+    if USE_BULK_REGISTER:
+        # Send all registrations in one request
+        response = post_body(URL_REGISTER_BULK, TEST_ADDRESSES_BULK_BYTES)
+        results = loads(response.content)["results"]
+    else:
+        # Registrations are independent, so send them concurrently
+        # (SESSION's pool_maxsize must cover max_workers)
+        with ThreadPoolExecutor(max_workers=len(TEST_ADDRESSES)) as ex:
+            responses = list(ex.map(
+                lambda b: post_body(URL_REGISTER, b),
+                TEST_ADDRESS_BYTES
+            ))
+        results = [loads(r.content) for r in responses]
     
-    for addr in test_addresses:
-        response = requests.post(f"{BASE_URL}/api/register-address", json=addr)
-        data = response.json()
-        print(f"✓ Registered: {data['address_code']} - {addr['area']}")
+    write_lines([
+        f"✓ Registered: {data['address_code']} - {addr['area']}"
+        for addr, data in zip(TEST_ADDRESSES, results)
+    ])
     
     # Step 6: Get system statistics
     print_section("Step 6: System Statistics")
-    response = requests.get(f"{BASE_URL}/stats")
-    stats = response.json()
-    print(f"Total Addresses: {stats['total_addresses']}")
-    print(f"Verified Addresses: {stats['verified_addresses']}")
-    print(f"Successful Deliveries: {stats['successful_deliveries']}")
-    print(f"Active Partners: {stats['active_partners']}")
-    print(f"Total Lookups: {stats['total_lookups']}")
-    print(f"Revenue Estimate: ${stats['revenue_estimate_usd']:.2f}")
+    stats = get_stats()
+    total, verified, delivered, partners, lookups, revenue = (stats[k] for k in (
+        "total_addresses", "verified_addresses", "successful_deliveries",
+        "active_partners", "total_lookups", "revenue_estimate_usd"
+    ))
+    write_lines([
+        f"Total Addresses: {total}",
+        f"Verified Addresses: {verified}",
+        f"Successful Deliveries: {delivered}",
+        f"Active Partners: {partners}",
+        f"Total Lookups: {lookups}",
+        f"Revenue Estimate: ${revenue:.2f}"
+    ])
     
     print_section("DEMO COMPLETE")
-    print("\nNext steps:")
-    print("1. Visit http://localhost:8000 for API documentation")
-    print("2. Visit http://localhost:8000/admin for admin dashboard")
-    print("3. Visit http://localhost:8000/docs for interactive API testing")
-    print("\n✨ The API is ready to use!")
+    write_lines([
+        "\nNext steps:",
+        "1. Visit http://localhost:8000 for API documentation",
+        "2. Visit http://localhost:8000/admin for admin dashboard",
+        "3. Visit http://localhost:8000/docs for interactive API testing",
+        "\n✨ The API is ready to use!"
+    ])
 
 if __name__ == "__main__":
     try:
@@ -120,3 +240,5 @@ if __name__ == "__main__":
         print("Make sure the API is running with: python main.py")
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
+    finally:
+        SESSION.close()